@@ -1,12 +1,107 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, abort, request, jsonify, render_template
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
 from flask_cors import CORS
-import requests
-import json
-from typing import Dict, List
+from werkzeug.exceptions import HTTPException
+import hashlib
+import orjson
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple
+
+try:
+    import hyperscan
+except ImportError:  # Optional: detection falls back to the pure-Python token scan
+    hyperscan = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider backed by orjson, so jsonify() responses are
+    serialized by a native extension instead of the stdlib json module
+    """
+    
+    def _options(self, sort_keys: bool, indent: bool = False) -> int:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = self._options(kwargs.get('sort_keys', self.sort_keys), bool(kwargs.get('indent')))
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        body = orjson.dumps(obj, default=self.default, option=self._options(self.sort_keys, indent))
+        return self._app.response_class(body, mimetype=self.mimetype)
 
 app = Flask(__name__)
+app.json_provider_class = OrjsonProvider
+app.json = OrjsonProvider(app)
+app.json.compact = True  # No indentation, even under debug=True
+app.json.sort_keys = False
 CORS(app)  # Enable CORS for frontend communication
 
+# Reject request bodies over 1 MiB; the largest valid batch is far smaller
+app.config['MAX_CONTENT_LENGTH'] = 1024 * 1024
+
+# Compress larger responses (mainly batch results); small ones aren't worth it
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_BR_LEVEL'] = 4
+app.config['COMPRESS_MIN_SIZE'] = 1024
+app.config['COMPRESS_STREAMS'] = False  # Compressing would buffer the whole NDJSON stream
+Compress(app)
+
+# Language mapping for common languages
+LANGUAGES = {
+    'en': 'English',
+    'es': 'Spanish', 
+    'fr': 'French',
+    'de': 'German',
+    'it': 'Italian',
+    'pt': 'Portuguese',
+    'ru': 'Russian',
+    'zh': 'Chinese',
+    'ja': 'Japanese',
+    'ko': 'Korean',
+    'ar': 'Arabic',
+    'hi': 'Hindi'
+}
+
+# Simple mock translations for demo
+MOCK_TRANSLATIONS = {
+    ('hello', 'en', 'es'): 'hola',
+    ('hello', 'en', 'fr'): 'bonjour',
+    ('hello', 'en', 'de'): 'hallo',
+    ('goodbye', 'en', 'es'): 'adiós',
+    ('goodbye', 'en', 'fr'): 'au revoir',
+    ('thank you', 'en', 'es'): 'gracias',
+    ('thank you', 'en', 'fr'): 'merci',
+    ('how are you', 'en', 'es'): 'cómo estás',
+    ('good morning', 'en', 'es'): 'buenos días',
+    ('good night', 'en', 'es'): 'buenas noches'
+}
+
+# Common words used by the language detection heuristic
+EN_STOP = frozenset(('the', 'and', 'is', 'in', 'to', 'of', 'a', 'that', 'it'))
+ES_STOP = frozenset(('el', 'la', 'de', 'que', 'y', 'es', 'en', 'un', 'ser'))
+FR_STOP = frozenset(('le', 'de', 'et', 'à', 'un', 'il', 'être', 'en'))
+_WORD_RE = re.compile(r"[\w']+")
+
+class TranslationResult(NamedTuple):
+    """Result of TranslationPredictor.translate_text"""
+    translated_text: str
+    confidence: float
+    source_lang: str
+    target_lang: str
+
 class TranslationPredictor:
     """
     Translation predictor using Google Translate API or local translation logic
@@ -14,101 +109,228 @@ class TranslationPredictor:
     """
     
     def __init__(self):
-        # Language mapping for common languages
-        self.languages = {
-            'en': 'English',
-            'es': 'Spanish', 
-            'fr': 'French',
-            'de': 'German',
-            'it': 'Italian',
-            'pt': 'Portuguese',
-            'ru': 'Russian',
-            'zh': 'Chinese',
-            'ja': 'Japanese',
-            'ko': 'Korean',
-            'ar': 'Arabic',
-            'hi': 'Hindi'
-        }
+        self.languages = LANGUAGES
+        self.mock_translations = MOCK_TRANSLATIONS
         
-        # Simple mock translations for demo
-        self.mock_translations = {
-            ('hello', 'en', 'es'): 'hola',
-            ('hello', 'en', 'fr'): 'bonjour',
-            ('hello', 'en', 'de'): 'hallo',
-            ('goodbye', 'en', 'es'): 'adiós',
-            ('goodbye', 'en', 'fr'): 'au revoir',
-            ('thank you', 'en', 'es'): 'gracias',
-            ('thank you', 'en', 'fr'): 'merci',
-            ('how are you', 'en', 'es'): 'cómo estás',
-            ('good morning', 'en', 'es'): 'buenos días',
-            ('good night', 'en', 'es'): 'buenas noches'
+        # Flat 'text|source|target' keys, so a lookup is a single dict probe
+        self._mock = {
+            f"{text}|{source}|{target}": translation
+            for (text, source, target), translation in self.mock_translations.items()
         }
+        
+        # Per-instance cache of translation results
+        self._translate_cached = lru_cache(maxsize=8192)(self._translate)
     
     def detect_language(self, text: str) -> str:
         """
         Simple language detection (mock implementation)
         In production, use langdetect library or Google Cloud Translate API
         """
-        # Simple heuristic based on common words
-        english_words = ['the', 'and', 'is', 'in', 'to', 'of', 'a', 'that', 'it']
-        spanish_words = ['el', 'la', 'de', 'que', 'y', 'es', 'en', 'un', 'ser']
-        french_words = ['le', 'de', 'et', 'à', 'un', 'il', 'être', 'et', 'en']
-        
-        text_lower = text.lower()
-        
-        english_count = sum(1 for word in english_words if word in text_lower)
-        spanish_count = sum(1 for word in spanish_words if word in text_lower)
-        french_count = sum(1 for word in french_words if word in text_lower)
-        
-        if english_count > spanish_count and english_count > french_count:
-            return 'en'
-        elif spanish_count > french_count:
-            return 'es'
-        elif french_count > 0:
-            return 'fr'
-        else:
-            return 'en'  # Default to English
-    
-    def translate_text(self, text: str, source_lang: str, target_lang: str) -> Dict:
+        # Normalize before the cache lookup so casing variants share an entry
+        text_lower = text.lower().strip()
+        if len(text_lower) > _MAX_CACHED_TEXT:
+            return _detect.__wrapped__(text_lower)
+        return _detect(text_lower)
+    
+    def translate_text(self, text: str, source_lang: str, target_lang: str) -> TranslationResult:
         """
         Translate text from source language to target language
         """
+        # Only cache short texts between supported languages, so entries stay small
+        if (len(text) > _MAX_CACHED_TEXT
+                or source_lang not in self.languages or target_lang not in self.languages):
+            return self._translate(text, source_lang, target_lang)
+        return self._translate_cached(text, source_lang, target_lang)
+    
+    def _translate(self, text: str, source_lang: str, target_lang: str) -> TranslationResult:
+        """Uncached implementation of translate_text"""
         if source_lang == target_lang:
-            return {
-                'translated_text': text,
-                'confidence': 1.0,
-                'source_lang': source_lang,
-                'target_lang': target_lang
-            }
+            return TranslationResult(text, 1.0, source_lang, target_lang)
         
         # Check mock translations first
         text_lower = text.lower().strip()
-        mock_key = (text_lower, source_lang, target_lang)
+        hit = self._mock.get(f"{text_lower}|{source_lang}|{target_lang}")
         
-        if mock_key in self.mock_translations:
-            return {
-                'translated_text': self.mock_translations[mock_key],
-                'confidence': 0.95,
-                'source_lang': source_lang,
-                'target_lang': target_lang
-            }
+        if hit is not None:
+            return TranslationResult(hit, 0.95, source_lang, target_lang)
         
         # For demo purposes, return a placeholder translation
         # In production, integrate with Google Translate API, Azure Translator, etc.
-        return {
-            'translated_text': f"[Translation of '{text}' from {source_lang} to {target_lang}]",
-            'confidence': 0.7,
-            'source_lang': source_lang,
-            'target_lang': target_lang
-        }
+        return TranslationResult(
+            f"[Translation of '{text}' from {source_lang} to {target_lang}]",
+            0.7,
+            source_lang,
+            target_lang
+        )
     
     def get_supported_languages(self) -> Dict[str, str]:
         """Return supported languages"""
         return self.languages
 
+def _compile_stopwords():
+    """
+    Compile every stopword into one Hyperscan database, so a single pass
+    over the text finds all of them. Returns (database, language per pattern id)
+    """
+    stopwords = [
+        ('en', EN_STOP),
+        ('es', ES_STOP),
+        ('fr', FR_STOP)
+    ]
+    languages = []
+    expressions = []
+    for lang, words in stopwords:
+        for word in sorted(words):
+            languages.append(lang)
+            # Same token boundaries as _WORD_RE
+            expressions.append(f"(^|[^\\w']){re.escape(word)}([^\\w']|$)".encode())
+    
+    database = hyperscan.Database()
+    database.compile(
+        expressions=expressions,
+        ids=list(range(len(expressions))),
+        elements=len(expressions),
+        flags=hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SINGLEMATCH
+    )
+    return database, tuple(languages)
+
+if hyperscan is not None:
+    _STOPWORD_DB, _STOPWORD_LANGS = _compile_stopwords()
+else:
+    _STOPWORD_DB, _STOPWORD_LANGS = None, ()
+
+# Hyperscan scratch space must not be shared between threads
+_scratch = threading.local()
+
+def _count_stopwords(text_lower: str) -> Dict[str, int]:
+    """Count the distinct stopwords of each language found in the text"""
+    counts = {'en': 0, 'es': 0, 'fr': 0}
+    
+    if _STOPWORD_DB is None:
+        tokens = set(_WORD_RE.findall(text_lower))
+        counts['en'] = len(tokens & EN_STOP)
+        counts['es'] = len(tokens & ES_STOP)
+        counts['fr'] = len(tokens & FR_STOP)
+        return counts
+    
+    scratch = getattr(_scratch, 'value', None)
+    if scratch is None:
+        scratch = _scratch.value = hyperscan.Scratch(_STOPWORD_DB)
+    
+    def on_match(pattern_id, start, end, flags, context):
+        counts[_STOPWORD_LANGS[pattern_id]] += 1
+    
+    _STOPWORD_DB.scan(text_lower.encode(), match_event_handler=on_match, scratch=scratch)
+    return counts
+
+# Longer texts bypass the LRU caches, so entries stay small
+_MAX_CACHED_TEXT = 256
+
+@lru_cache(maxsize=4096)
+def _detect(text_lower: str) -> str:
+    """Cached heuristic behind TranslationPredictor.detect_language"""
+    # Simple heuristic based on common words, matched as whole tokens
+    counts = _count_stopwords(text_lower)
+    
+    english_count = counts['en']
+    spanish_count = counts['es']
+    french_count = counts['fr']
+    
+    if english_count > spanish_count and english_count > french_count:
+        return 'en'
+    elif spanish_count > french_count:
+        return 'es'
+    elif french_count > 0:
+        return 'fr'
+    else:
+        return 'en'  # Default to English
+
 # Initialize translator
 translator = TranslationPredictor()
 
+# Largest number of texts accepted by the batch endpoints
+MAX_BATCH = 1000
+
+# Bound lookups used by the views on every request
+_LANG_NAME = translator.languages.get
+_DETECT = translator.detect_language
+_TRANSLATE = translator.translate_text
+
+# The language list is static, so serialize it once at startup
+_LANGUAGES_BODY = orjson.dumps({
+    'success': True,
+    'languages': translator.get_supported_languages()
+})
+_LANGUAGES_ETAG = hashlib.md5(_LANGUAGES_BODY).hexdigest()
+
+# /api/translate responses have a fixed schema: only the two texts vary freely,
+# so the rest of the body is prebuilt per (source, target, confidence). The views
+# validate language codes first, so only a small fixed set of tails is cached
+_TRANSLATE_PREFIX = b'{"success":true,"original_text":'
+_TRANSLATE_MID = b',"translated_text":'
+
+@lru_cache(maxsize=1024)
+def _translate_suffix(source_lang: str, target_lang: str, confidence: float) -> bytes:
+    """Serialized tail of an /api/translate response, after translated_text"""
+    tail = orjson.dumps({
+        'source_language': source_lang,
+        'source_language_name': _LANG_NAME(source_lang, 'Unknown'),
+        'target_language': target_lang,
+        'target_language_name': _LANG_NAME(target_lang, 'Unknown'),
+        'confidence': confidence
+    })
+    return b',' + tail[1:]
+
+def _translate_body(text: str, result: TranslationResult) -> bytes:
+    """Serialized /api/translate response for a validated translation"""
+    return (
+        _TRANSLATE_PREFIX + orjson.dumps(text)
+        + _TRANSLATE_MID + orjson.dumps(result.translated_text)
+        + _translate_suffix(result.source_lang, result.target_lang, result.confidence)
+    )
+
+@app.errorhandler(HTTPException)
+def handle_http_error(e):
+    """Return HTTP errors (e.g. abort(400)) as JSON"""
+    # Start from the default response to keep headers such as Allow
+    response = e.get_response()
+    response.set_data(app.json.dumps({
+        'success': False,
+        'error': e.description
+    }))
+    response.content_type = 'application/json'
+    return response
+
+@app.errorhandler(Exception)
+def handle_error(e):
+    """Return unexpected errors from any view as JSON"""
+    if app.debug:
+        raise e  # Let the interactive debugger show the traceback
+    app.logger.exception('Unhandled error')
+    return jsonify({
+        'success': False,
+        'error': str(e)
+    }), 500
+
+def _read_json() -> Dict[str, Any]:
+    """Parse the request body as a JSON object, aborting with 400 otherwise"""
+    try:
+        data = orjson.loads(request.get_data(cache=False))
+    except orjson.JSONDecodeError:
+        abort(400, description='Invalid JSON body')
+    if not isinstance(data, dict):
+        abort(400, description='Invalid JSON body')
+    return data
+
+def _check_languages(source_lang: Any, target_lang: Any) -> None:
+    """Abort with 400 unless both codes are supported ('auto' is allowed as source)"""
+    if not isinstance(source_lang, str) or not isinstance(target_lang, str):
+        abort(400, description='Language codes must be strings')
+    if source_lang != 'auto' and source_lang not in LANGUAGES:
+        abort(400, description='Unsupported source language')
+    if target_lang not in LANGUAGES:
+        abort(400, description='Unsupported target language')
+
 @app.route('/')
 def index():
     """Serve the main page"""
@@ -117,121 +339,117 @@ def index():
 @app.route('/api/languages', methods=['GET'])
 def get_languages():
     """Get list of supported languages"""
-    return jsonify({
-        'success': True,
-        'languages': translator.get_supported_languages()
-    })
+    response = Response(_LANGUAGES_BODY, mimetype='application/json')
+    response.set_etag(_LANGUAGES_ETAG)
+    return response.make_conditional(request)
 
 @app.route('/api/detect', methods=['POST'])
 def detect_language():
     """Detect language of input text"""
-    try:
-        data = request.get_json()
-        text = data.get('text', '').strip()
-        
-        if not text:
-            return jsonify({
-                'success': False,
-                'error': 'No text provided'
-            }), 400
-        
-        detected_lang = translator.detect_language(text)
-        
-        return jsonify({
-            'success': True,
-            'detected_language': detected_lang,
-            'language_name': translator.languages.get(detected_lang, 'Unknown'),
-            'text': text
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    data = _read_json()
+    text = data.get('text', '')
+    if not isinstance(text, str):
+        abort(400, description='Text must be a string')
+    text = text.strip()
+    
+    if not text:
+        abort(400, description='No text provided')
+    
+    detected_lang = _DETECT(text)
+    
+    return jsonify({
+        'success': True,
+        'detected_language': detected_lang,
+        'language_name': _LANG_NAME(detected_lang, 'Unknown'),
+        'text': text
+    })
 
 @app.route('/api/translate', methods=['POST'])
 def translate():
     """Translate text between languages"""
-    try:
-        data = request.get_json()
-        text = data.get('text', '').strip()
-        source_lang = data.get('source_lang', 'auto')
-        target_lang = data.get('target_lang', 'en')
-        
-        if not text:
-            return jsonify({
-                'success': False,
-                'error': 'No text provided'
-            }), 400
-        
-        # Auto-detect source language if needed
-        if source_lang == 'auto':
-            source_lang = translator.detect_language(text)
-        
-        # Perform translation
-        result = translator.translate_text(text, source_lang, target_lang)
-        
-        return jsonify({
-            'success': True,
-            'original_text': text,
-            'translated_text': result['translated_text'],
-            'source_language': source_lang,
-            'source_language_name': translator.languages.get(source_lang, 'Unknown'),
-            'target_language': target_lang,
-            'target_language_name': translator.languages.get(target_lang, 'Unknown'),
-            'confidence': result['confidence']
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    data = _read_json()
+    text = data.get('text', '')
+    if not isinstance(text, str):
+        abort(400, description='Text must be a string')
+    text = text.strip()
+    source_lang = data.get('source_lang', 'auto')
+    target_lang = data.get('target_lang', 'en')
+    
+    if not text:
+        abort(400, description='No text provided')
+    _check_languages(source_lang, target_lang)
+    
+    # Auto-detect source language if needed
+    if source_lang == 'auto':
+        source_lang = _DETECT(text)
+    
+    # Perform translation
+    result = _TRANSLATE(text, source_lang, target_lang)
+    
+    return Response(_translate_body(text, result), mimetype='application/json')
+
+def _read_batch_request():
+    """Parse and validate a batch request, returning (texts, source_lang, target_lang)"""
+    data = _read_json()
+    texts = data.get('texts', [])
+    source_lang = data.get('source_lang', 'auto')
+    target_lang = data.get('target_lang', 'en')
+    
+    if not texts:
+        abort(400, description='No texts provided')
+    if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+        abort(400, description='Texts must be a list of strings')
+    _check_languages(source_lang, target_lang)
+    if len(texts) > MAX_BATCH:
+        abort(413, description=f'Too many texts (maximum {MAX_BATCH})')
+    
+    # Strip once and drop blank entries
+    stripped = [text.strip() for text in texts]
+    return [text for text in stripped if text], source_lang, target_lang
+
+def _batch_result(text: str, source_lang: str, result: TranslationResult) -> Dict[str, Any]:
+    """Build the per-text entry returned by the batch endpoints"""
+    return {
+        'original_text': text,
+        'translated_text': result.translated_text,
+        'source_language': source_lang,
+        'confidence': result.confidence
+    }
+
+def _iter_batch(texts: List[str], source_lang: str, target_lang: str):
+    """Yield one result entry per text of a batch request"""
+    if source_lang != 'auto' and source_lang == target_lang:
+        # Nothing to translate: echo every text back verbatim
+        for text in texts:
+            yield _batch_result(text, source_lang, TranslationResult(text, 1.0, source_lang, target_lang))
+        return
+    
+    for text in texts:
+        source = _DETECT(text) if source_lang == 'auto' else source_lang
+        yield _batch_result(text, source, _TRANSLATE(text, source, target_lang))
 
 @app.route('/api/translate_batch', methods=['POST'])
 def translate_batch():
     """Translate multiple texts at once"""
-    try:
-        data = request.get_json()
-        texts = data.get('texts', [])
-        source_lang = data.get('source_lang', 'auto')
-        target_lang = data.get('target_lang', 'en')
-        
-        if not texts:
-            return jsonify({
-                'success': False,
-                'error': 'No texts provided'
-            }), 400
-        
-        results = []
-        for text in texts:
-            if text.strip():
-                # Auto-detect if needed
-                current_source = source_lang
-                if source_lang == 'auto':
-                    current_source = translator.detect_language(text)
-                
-                result = translator.translate_text(text, current_source, target_lang)
-                results.append({
-                    'original_text': text,
-                    'translated_text': result['translated_text'],
-                    'source_language': current_source,
-                    'confidence': result['confidence']
-                })
-        
-        return jsonify({
-            'success': True,
-            'results': results,
-            'target_language': target_lang,
-            'target_language_name': translator.languages.get(target_lang, 'Unknown')
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    texts, source_lang, target_lang = _read_batch_request()
+    
+    return jsonify({
+        'success': True,
+        'results': list(_iter_batch(texts, source_lang, target_lang)),
+        'target_language': target_lang,
+        'target_language_name': _LANG_NAME(target_lang, 'Unknown')
+    })
+
+@app.route('/api/translate_batch_stream', methods=['POST'])
+def translate_batch_stream():
+    """Translate multiple texts, streaming one JSON result per line (NDJSON)"""
+    texts, source_lang, target_lang = _read_batch_request()
+    
+    def generate():
+        for item in _iter_batch(texts, source_lang, target_lang):
+            yield orjson.dumps(item) + b'\n'
+    
+    return Response(generate(), mimetype='application/x-ndjson')
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,13 @@
+# Gunicorn settings, loaded automatically from the working directory
+# Run with: gunicorn wsgi:application
+# For I/O-bound workloads: gunicorn -k gevent --worker-connections 1000 wsgi:application
+import multiprocessing
+import os
+
+# One process per core, each serving requests on a small thread pool
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+# Keep client connections open between requests
+keepalive = 5
@@ -0,0 +1,104 @@
+import orjson
+import pytest
+
+import app
+
+@pytest.fixture
+def client():
+    return app.app.test_client()
+
+def _jsonify_body(text, result):
+    """What jsonify would have produced for an /api/translate response"""
+    return app.app.json.dumps({
+        'success': True,
+        'original_text': text,
+        'translated_text': result.translated_text,
+        'source_language': result.source_lang,
+        'source_language_name': app.LANGUAGES.get(result.source_lang, 'Unknown'),
+        'target_language': result.target_lang,
+        'target_language_name': app.LANGUAGES.get(result.target_lang, 'Unknown'),
+        'confidence': result.confidence
+    }).encode()
+
+@pytest.mark.parametrize('text, source_lang, target_lang', [
+    ('hello', 'en', 'es'),
+    ('hello', 'en', 'en'),
+    ('He said "hi"\\', 'en', 'fr'),
+    ('line one\nline two\ttab', 'en', 'de'),
+    ('été à Zürich — 東京 😀', 'fr', 'ja'),
+    ('unknown code', 'en', 'zz'),
+])
+def test_translate_body_matches_jsonify(text, source_lang, target_lang):
+    result = app.translator._translate(text, source_lang, target_lang)
+    assert app._translate_body(text, result) == _jsonify_body(text, result)
+
+def test_translate_response_matches_jsonify(client):
+    response = client.post('/api/translate', json={'text': 'Il a dit "oui"\n', 'target_lang': 'es'})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/json'
+    result = app.translator.translate_text('Il a dit "oui"', 'fr', 'es')
+    assert response.data == _jsonify_body('Il a dit "oui"', result)
+
+@pytest.mark.parametrize('source_lang, target_lang', [
+    ('en', 'zz'),
+    ('zz', 'en'),
+    ('en', 'x' * 100000),
+    ('x' * 100000, 'en'),
+    (1, 'en'),
+    ('en', True),
+])
+def test_translate_rejects_unsupported_language_codes(client, source_lang, target_lang):
+    suffix_entries = app._translate_suffix.cache_info().currsize
+    translate_entries = app.translator._translate_cached.cache_info().currsize
+    
+    response = client.post('/api/translate', json={
+        'text': 'hello', 'source_lang': source_lang, 'target_lang': target_lang
+    })
+    
+    assert response.status_code == 400
+    assert orjson.loads(response.data)['success'] is False
+    assert app._translate_suffix.cache_info().currsize == suffix_entries
+    assert app.translator._translate_cached.cache_info().currsize == translate_entries
+
+BATCH = {'texts': ['hello', '  ', 'le chat et il', 'Goodbye'], 'source_lang': 'auto', 'target_lang': 'es'}
+
+def test_translate_batch_stream_is_ndjson(client):
+    response = client.post('/api/translate_batch_stream', json=BATCH)
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    lines = response.data.split(b'\n')
+    assert lines[-1] == b''
+    items = [orjson.loads(line) for line in lines[:-1]]
+    assert [item['original_text'] for item in items] == ['hello', 'le chat et il', 'Goodbye']
+    assert all(isinstance(item, dict) for item in items)
+
+@pytest.mark.parametrize('payload', [
+    BATCH,
+    {'texts': ['hello', 'thank you'], 'source_lang': 'en', 'target_lang': 'en'},
+    {'texts': ['hello', 'good night'], 'source_lang': 'en', 'target_lang': 'es'},
+])
+def test_translate_batch_and_stream_return_same_items(client, payload):
+    batch = client.post('/api/translate_batch', json=payload)
+    stream = client.post('/api/translate_batch_stream', json=payload)
+    streamed = [orjson.loads(line) for line in stream.data.splitlines()]
+    assert orjson.loads(batch.data)['results'] == streamed
+
+@pytest.mark.parametrize('path', ['/api/translate_batch', '/api/translate_batch_stream'])
+def test_translate_batch_rejects_more_than_max_batch(client, path):
+    response = client.post(path, json={'texts': ['hi'] * (app.MAX_BATCH + 1), 'target_lang': 'es'})
+    assert response.status_code == 413
+    assert orjson.loads(response.data)['success'] is False
+    
+    response = client.post(path, json={'texts': ['hi'] * app.MAX_BATCH, 'target_lang': 'es'})
+    assert response.status_code == 200
+
+def test_languages_etag_allows_conditional_requests(client):
+    response = client.get('/api/languages')
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+    assert etag
+    assert orjson.loads(response.data)['languages'] == app.LANGUAGES
+    
+    response = client.get('/api/languages', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
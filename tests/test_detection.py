@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+pytest.importorskip('hyperscan')
+
+import app
+
+SAMPLES = [
+    '',
+    'the cat and the dog',
+    'bathe',
+    'el perro y la casa',
+    'le chat et il',
+    "qu'il est là",
+    "l'été est là et il",
+    'à être',
+    "It's the end, de la",
+    'the\nand',
+    'un de en',
+    'is it a that of to in',
+]
+
+def _token_counts(text_lower):
+    tokens = set(app._WORD_RE.findall(text_lower))
+    return {
+        'en': len(tokens & app.EN_STOP),
+        'es': len(tokens & app.ES_STOP),
+        'fr': len(tokens & app.FR_STOP)
+    }
+
+def _random_texts(count):
+    rng = random.Random(0)
+    words = sorted(app.EN_STOP | app.ES_STOP | app.FR_STOP) + ['cat', 'bathe', 'été', "qu'il"]
+    separators = [' ', '  ', "'", ',', '\n', '-', '']
+    for _ in range(count):
+        parts = [rng.choice(words) + rng.choice(separators) for _ in range(rng.randint(0, 8))]
+        yield ''.join(parts)
+
+@pytest.mark.parametrize('text', SAMPLES)
+def test_hyperscan_counts_match_token_scan(text):
+    assert app._count_stopwords(text) == _token_counts(text)
+
+def test_hyperscan_counts_match_token_scan_random():
+    for text in _random_texts(2000):
+        assert app._count_stopwords(text) == _token_counts(text), text